@@ -63,6 +63,13 @@ setup(
     install_requires=[
         "datasets",
         "numpy",
+        "pyarrow",
         "tqdm"
     ],
+    extras_require={
+        "hashing": [
+            "blake3",
+            "xxhash"
+        ]
+    },
 )
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Louis Brulé Naudet. All Rights Reserved.
+# This software may be used and distributed according to the terms of License Agreement.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import lru_cache
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    Union,
+    Mapping,
+    TypeVar,
+    Callable,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+
+
+# Batches smaller than this are hashed on the CPU, where they finish before
+# the host-to-device and device-to-host copies would amortize.
+CUDA_MIN_BATCH_SIZE = 10000
+
+# The number of CUDA threads per block, each thread hashing one document.
+CUDA_THREADS_PER_BLOCK = 256
+
+# SHA-256 (FIPS 180-4) with one document per thread. The padding is generated on
+# the fly while the message schedule is loaded, so documents are read in place from
+# the concatenated buffer, and each digest is written out as 64 hexadecimal digits.
+_SHA256_KERNEL = r"""
+#define ROTR(x, n) (((x) >> (n)) | ((x) << (32 - (n))))
+
+__constant__ unsigned int K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+extern "C" __global__ void sha256_kernel(
+    const unsigned char* data,
+    const long long* offsets,
+    unsigned char* digests,
+    const long long n
+) {
+    const long long i = (long long) blockIdx.x * blockDim.x + threadIdx.x;
+
+    if (i >= n) {
+        return;
+    }
+
+    const unsigned char* message = data + offsets[i];
+    const unsigned long long length = offsets[i + 1] - offsets[i];
+    const unsigned long long bit_length = length * 8;
+
+    // The message, a 0x80 byte and the 64-bit length, rounded up to 64-byte blocks
+    const unsigned long long num_blocks = (length + 72) / 64;
+
+    unsigned int h[8] = {
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    };
+    unsigned int w[64];
+
+    for (unsigned long long block = 0; block < num_blocks; ++block) {
+        for (int t = 0; t < 16; ++t) {
+            unsigned int word = 0;
+
+            for (int k = 0; k < 4; ++k) {
+                const unsigned long long position = block * 64 + t * 4 + k;
+                unsigned int byte = 0;
+
+                if (position < length) {
+                    byte = message[position];
+                } else if (position == length) {
+                    byte = 0x80;
+                } else if (block == num_blocks - 1 && t >= 14) {
+                    byte = (bit_length >> (8 * (7 - ((t - 14) * 4 + k)))) & 0xff;
+                }
+
+                word = (word << 8) | byte;
+            }
+
+            w[t] = word;
+        }
+
+        for (int t = 16; t < 64; ++t) {
+            const unsigned int s0 = ROTR(w[t - 15], 7) ^ ROTR(w[t - 15], 18) ^ (w[t - 15] >> 3);
+            const unsigned int s1 = ROTR(w[t - 2], 17) ^ ROTR(w[t - 2], 19) ^ (w[t - 2] >> 10);
+
+            w[t] = w[t - 16] + s0 + w[t - 7] + s1;
+        }
+
+        unsigned int a = h[0], b = h[1], c = h[2], d = h[3], e = h[4], f = h[5], g = h[6], hh = h[7];
+
+        for (int t = 0; t < 64; ++t) {
+            const unsigned int t1 = hh + (ROTR(e, 6) ^ ROTR(e, 11) ^ ROTR(e, 25)) + ((e & f) ^ (~e & g)) + K[t] + w[t];
+            const unsigned int t2 = (ROTR(a, 2) ^ ROTR(a, 13) ^ ROTR(a, 22)) + ((a & b) ^ (a & c) ^ (b & c));
+
+            hh = g;
+            g = f;
+            f = e;
+            e = d + t1;
+            d = c;
+            c = b;
+            b = a;
+            a = t1 + t2;
+        }
+
+        h[0] += a;
+        h[1] += b;
+        h[2] += c;
+        h[3] += d;
+        h[4] += e;
+        h[5] += f;
+        h[6] += g;
+        h[7] += hh;
+    }
+
+    const char* hex_digits = "0123456789abcdef";
+
+    for (int j = 0; j < 8; ++j) {
+        for (int k = 0; k < 8; ++k) {
+            digests[i * 64 + j * 8 + k] = hex_digits[(h[j] >> (28 - 4 * k)) & 0xf];
+        }
+    }
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def cuda_available() -> bool:
+    """
+    Returns whether documents can be hashed on a CUDA device.
+
+    Returns
+    -------
+    bool
+        True if CuPy is installed and at least one CUDA device is visible.
+    """
+    try:
+        import cupy
+
+        return cupy.cuda.runtime.getDeviceCount() > 0
+
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _sha256_kernel():
+    """
+    Compiles the SHA-256 kernel, once per process.
+
+    Returns
+    -------
+    cupy.RawKernel
+        The compiled kernel.
+    """
+    import cupy
+
+    return cupy.RawKernel(_SHA256_KERNEL, "sha256_kernel")
+
+
+def sha256_many_cuda(
+    documents: Sequence[Union[bytes, memoryview]]
+) -> List[str]:
+    """
+    Compute the SHA-256 hexadecimal digest of each document on a CUDA device.
+
+    The documents are concatenated into one buffer and copied to the device with
+    their offsets, each CUDA thread hashes one document, and the digests are copied
+    back as a single buffer of hexadecimal digits.
+
+    Parameters
+    ----------
+    documents : Sequence[Union[bytes, memoryview]]
+        The encoded documents to be hashed, as bytes or zero-copy memoryviews.
+
+    Returns
+    -------
+    List[str]
+        The digests, represented as hexadecimal strings, in the same order as `documents`.
+    """
+    import cupy
+
+    n = len(documents)
+
+    if n == 0:
+        return []
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(document) for document in documents], out=offsets[1:])
+
+    data = cupy.asarray(np.frombuffer(b"".join(documents) or b"\0", dtype=np.uint8))
+    digests = cupy.empty(64 * n, dtype=np.uint8)
+
+    _sha256_kernel()(
+        (-(-n // CUDA_THREADS_PER_BLOCK),),
+        (CUDA_THREADS_PER_BLOCK,),
+        (data, cupy.asarray(offsets), digests, np.int64(n))
+    )
+
+    text = digests.get().tobytes().decode("ascii")
+
+    return [text[start:start + 64] for start in range(0, 64 * n, 64)]
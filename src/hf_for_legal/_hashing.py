@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Louis Brulé Naudet. All Rights Reserved.
+# This software may be used and distributed according to the terms of License Agreement.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    Union,
+    Mapping,
+    TypeVar,
+    Callable,
+    Optional,
+    Sequence,
+)
+
+from hf_for_legal._cuda import (
+    CUDA_MIN_BATCH_SIZE, 
+    cuda_available, 
+    sha256_many_cuda
+)
+
+
+# The supported hash algorithms. "blake3" and "xxh3_128" rely on optional packages.
+HASH_ALGORITHMS = ("sha256", "blake3", "xxh3_128")
+
+# The devices documents can be hashed on. "cuda" relies on the optional `cupy` package.
+HASH_DEVICES = ("cpu", "cuda")
+
+# hashlib releases the GIL while hashing inputs larger than this many bytes.
+HASHLIB_GIL_MINSIZE = 2048
+
+# Only documents up to this many bytes are kept in a duplicate cache, which bounds
+# the memory it holds to HASH_CACHE_SIZE * HASH_CACHE_MAX_DOCUMENT_SIZE.
+HASH_CACHE_SIZE = 16384
+HASH_CACHE_MAX_DOCUMENT_SIZE = 4096
+
+
+def hasher(
+    algorithm: str
+) -> Callable:
+    """
+    Returns the hash object constructor of an algorithm.
+
+    The optional backends are imported on first use, so that they are only
+    required when the corresponding algorithm is selected.
+
+    Parameters
+    ----------
+    algorithm : str
+        The name of the hash algorithm, one of `HASH_ALGORITHMS`.
+
+    Returns
+    -------
+    Callable
+        A constructor taking the data to be hashed and returning an object with a `hexdigest` method.
+
+    Raises
+    ------
+    ValueError
+        If the algorithm is not supported.
+
+    ImportError
+        If the package providing the algorithm is not installed.
+    """
+    if algorithm == "sha256":
+        return hashlib.sha256
+
+    if algorithm == "blake3":
+        try:
+            from blake3 import blake3
+
+        except ImportError as error:
+            raise ImportError("The 'blake3' hash algorithm requires the `blake3` package: pip install blake3") from error
+
+        return blake3
+
+    if algorithm == "xxh3_128":
+        try:
+            from xxhash import xxh3_128
+
+        except ImportError as error:
+            raise ImportError("The 'xxh3_128' hash algorithm requires the `xxhash` package: pip install xxhash") from error
+
+        return xxh3_128
+
+    raise ValueError(f"Unsupported hash algorithm '{algorithm}', expected one of {HASH_ALGORITHMS}.")
+
+
+def _hash_lane(
+    documents: Sequence[Union[bytes, memoryview]], 
+    algorithm: str = "sha256", 
+    cache: Optional[Dict[bytes, str]] = None
+) -> List[str]:
+    """
+    Compute the hexadecimal digest of each document, sequentially.
+
+    Parameters
+    ----------
+    documents : Sequence[Union[bytes, memoryview]]
+        The encoded documents to be hashed, as bytes or zero-copy memoryviews.
+
+    algorithm : str, optional
+        The name of the hash algorithm. Default is "sha256".
+
+    cache : Dict[bytes, str], optional
+        The duplicate cache, in which the digests of short documents are looked up first
+        and stored. If None, every document is hashed.
+
+    Returns
+    -------
+    List[str]
+        The digests, represented as hexadecimal strings.
+    """
+    new = hasher(algorithm)
+
+    if cache is None:
+        return [new(document).hexdigest() for document in documents]
+
+    digests = []
+
+    for document in documents:
+        if len(document) > HASH_CACHE_MAX_DOCUMENT_SIZE:
+            digests.append(new(document).hexdigest())
+            continue
+
+        key = bytes(document)
+        digest = cache.get(key)
+
+        if digest is None:
+            digest = new(document).hexdigest()
+
+            if len(cache) < HASH_CACHE_SIZE:
+                cache[key] = digest
+
+        digests.append(digest)
+
+    return digests
+
+
+def hash_many(
+    documents: Sequence[Union[bytes, memoryview]], 
+    algorithm: str = "sha256", 
+    workers: Optional[int] = None, 
+    cache: Optional[Dict[bytes, str]] = None, 
+    device: str = "cpu"
+) -> List[str]:
+    """
+    Compute the hexadecimal digest of each document in a batch.
+
+    `hashlib.sha256` is backed by OpenSSL, which selects the SHA-NI
+    (or AVX2/SSSE3) block function at runtime, so the remaining cost per
+    document is the Python call itself. The constructor is bound once for
+    the whole batch and each document is hashed with a single call.
+
+    When SHA-256 documents are large enough for hashlib to release the GIL,
+    the batch is split into contiguous lanes hashed concurrently by a
+    thread pool, so several documents are in flight at once.
+
+    BLAKE3 and XXH3 are not cryptographic-strength replacements for every
+    use of SHA-256, but they are several times faster and are enough to
+    identify or deduplicate rows.
+
+    SHA-256 batches of at least `CUDA_MIN_BATCH_SIZE` documents can be hashed on a
+    CUDA device instead, one document per thread. Smaller batches, or any batch when
+    no device is available, are hashed on the CPU.
+
+    Parameters
+    ----------
+    documents : Sequence[Union[bytes, memoryview]]
+        The encoded documents to be hashed, as bytes or zero-copy memoryviews.
+
+    algorithm : str, optional
+        The name of the hash algorithm, one of `HASH_ALGORITHMS`. Default is "sha256".
+
+    workers : int, optional
+        The maximum number of lanes to hash concurrently. Defaults to the number of CPUs.
+
+    cache : Dict[bytes, str], optional
+        A duplicate cache in which the digests of short documents are memoized, up to
+        `HASH_CACHE_SIZE` of them, so that repeated documents (boilerplate clauses, standard
+        recitals) are hashed once. The caller owns it and can share it across batches.
+        Looking a document up costs about as much as hashing it, so this only pays off
+        on corpora with a high duplication rate. If None, every document is hashed.
+
+    device : str, optional
+        The device to hash SHA-256 batches on, one of `HASH_DEVICES`. Default is "cpu".
+
+    Returns
+    -------
+    List[str]
+        The digests, represented as hexadecimal strings, in the same order as `documents`.
+    """
+    if (
+        device == "cuda" 
+        and algorithm == "sha256" 
+        and len(documents) >= CUDA_MIN_BATCH_SIZE 
+        and cuda_available()
+    ):
+        return sha256_many_cuda(documents)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    workers = min(workers, len(documents))
+    lane = partial(_hash_lane, algorithm=algorithm, cache=cache)
+
+    if (
+        algorithm != "sha256" 
+        or workers <= 1 
+        or sum(map(len, documents)) < HASHLIB_GIL_MINSIZE * len(documents)
+    ):
+        return lane(documents)
+
+    step = -(-len(documents) // workers)
+    lanes = [documents[start:start + step] for start in range(0, len(documents), step)]
+
+    with ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+        return [digest for digests in executor.map(lane, lanes) for digest in digests]
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Louis Brulé Naudet. All Rights Reserved.
+# This software may be used and distributed according to the terms of License Agreement.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import queue
+import threading
+
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    Union,
+    Mapping,
+    TypeVar,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+
+# How long the producer waits on a full queue before checking whether the consumer stopped.
+_PUT_TIMEOUT = 0.1
+
+
+def prefetch(
+    iterable: Iterable[Any], 
+    depth: int = 2
+) -> Iterator[Any]:
+    """
+    Iterate over `iterable` while a background thread reads up to `depth` items ahead.
+
+    The items are produced into a bounded queue, so reading item N+1 (e.g. paging
+    an Arrow batch in from slow storage) overlaps with the processing of item N,
+    as long as that processing releases the GIL, as hashlib does for large inputs.
+
+    Parameters
+    ----------
+    iterable : Iterable[Any]
+        The items to be read ahead.
+
+    depth : int, optional
+        The maximum number of items read ahead. If 0, `iterable` is iterated in the
+        current thread. Default is 2.
+
+    Yields
+    ------
+    Any
+        The items of `iterable`, in order. An exception raised while reading them
+        is raised again in the consumer.
+    """
+    if depth <= 0:
+        yield from iterable
+        return
+
+    items = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(
+        item: Tuple[bool, Any]
+    ) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=_PUT_TIMEOUT)
+                return True
+
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((False, item)):
+                    return
+
+        except BaseException as error:
+            put((True, error))
+            return
+
+        put((True, None))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            done, item = items.get()
+
+            if done:
+                if item is not None:
+                    raise item
+
+                return
+
+            yield item
+
+    finally:
+        # Unblocks the producer if the consumer stops early
+        stopped.set()
+        producer.join()
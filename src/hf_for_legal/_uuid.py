@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Louis Brulé Naudet. All Rights Reserved.
+# This software may be used and distributed according to the terms of License Agreement.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    Union,
+    Mapping,
+    TypeVar,
+    Callable,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+import pyarrow as pa
+
+
+# ASCII codes of the hexadecimal digits, indexed by nibble value.
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+# Positions of the 32 hexadecimal digits within the 36-character canonical form.
+_DIGIT_POSITIONS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+
+
+def _uuid4_characters(
+    n: int
+) -> np.ndarray:
+    """
+    Generate the characters of `n` random (version 4) UUIDs in their canonical form.
+
+    The random bytes for the whole batch are drawn with a single `os.urandom`
+    call, the RFC 4122 version and variant bits are set on all rows at once,
+    and the hexadecimal formatting is done by NumPy, so no `uuid.UUID` object
+    is allocated.
+
+    Parameters
+    ----------
+    n : int
+        The number of UUIDs to generate.
+
+    Returns
+    -------
+    np.ndarray
+        The ASCII codes of the UUIDs, as a (n, 36) array of uint8.
+    """
+    random = np.frombuffer(bytearray(os.urandom(16 * n)), dtype=np.uint8).reshape(n, 16)
+
+    # Version 4 in the high nibble of byte 6, RFC 4122 variant in the high bits of byte 8
+    random[:, 6] = (random[:, 6] & 0x0F) | 0x40
+    random[:, 8] = (random[:, 8] & 0x3F) | 0x80
+
+    digits = np.empty((n, 32), dtype=np.uint8)
+    digits[:, 0::2] = _HEX_DIGITS[random >> 4]
+    digits[:, 1::2] = _HEX_DIGITS[random & 0x0F]
+
+    characters = np.full((n, 36), ord("-"), dtype=np.uint8)
+    characters[:, _DIGIT_POSITIONS] = digits
+
+    return characters
+
+
+def uuid4_array(
+    n: int
+) -> pa.StringArray:
+    """
+    Generate `n` random (version 4) UUIDs as an Arrow string array.
+
+    The generated characters become the values buffer of the array as is, next to
+    fixed-stride offsets, so no Python string is created for any of the UUIDs.
+
+    Parameters
+    ----------
+    n : int
+        The number of UUIDs to generate.
+
+    Returns
+    -------
+    pa.StringArray
+        The generated UUIDs, e.g. "0b5c1a3e-8f1d-4c4e-9a6b-2f0d7e9c1b2a".
+    """
+    offsets = np.arange(0, 36 * (n + 1), 36, dtype=np.int32)
+
+    return pa.Array.from_buffers(
+        pa.string(), 
+        n, 
+        [None, pa.py_buffer(offsets), pa.py_buffer(_uuid4_characters(n))]
+    )
@@ -8,8 +8,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import hashlib
-import uuid
+import os
 
 from typing import (
     IO,
@@ -29,11 +28,542 @@ from typing import (
 
 import datasets
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pads
 
+from hf_for_legal._cuda import cuda_available
 from hf_for_legal._decorators import (
+    logger, 
     memory, 
     timer
 )
+from hf_for_legal._hashing import (
+    HASH_DEVICES, 
+    hash_many, 
+    hasher
+)
+from hf_for_legal._prefetch import prefetch
+from hf_for_legal._uuid import uuid4_array
+
+
+# Python types that Arrow converts the same way as their constructor, with the dtype to cast to.
+_ARROW_CAST_TYPES = {
+    int: "int64",
+    float: "float64",
+    str: "string"
+}
+
+# The Arrow batch functions process tens of thousands of rows in milliseconds, less
+# than it takes to spawn a worker, so each worker is given at least this many rows.
+_MIN_ROWS_PER_PROCESS = 50000
+
+# Columns up to this many values get an exact median, which sorts a copy of the column.
+# Larger columns get a t-digest approximation, which only keeps a bounded sketch.
+_EXACT_MEDIAN_MAX_SIZE = 1000000
+
+
+# Batch functions are kept at module scope so that `datasets` can pickle them
+# and fingerprint them consistently when `num_proc` > 1.
+
+def _set_column(
+    table: pa.Table, 
+    column_name: str, 
+    column: Union[pa.Array, pa.ChunkedArray]
+) -> pa.Table:
+    """
+    Replaces a column of an Arrow table, or appends it if it does not exist yet.
+
+    Parameters
+    ----------
+    table : pa.Table
+        The Arrow table.
+
+    column_name : str
+        The name of the column to be set.
+
+    column : Union[pa.Array, pa.ChunkedArray]
+        The values of the column.
+
+    Returns
+    -------
+    pa.Table
+        The table with the column set.
+    """
+    if column_name in table.column_names:
+        return table.set_column(table.column_names.index(column_name), column_name, column)
+
+    return table.append_column(column_name, column)
+
+
+def _encoded_documents(
+    column: pa.ChunkedArray
+) -> List[Union[bytes, memoryview]]:
+    """
+    Returns the UTF-8 encoding of each value of a column.
+
+    Arrow already stores strings as UTF-8 in a single values buffer, so for string
+    columns without missing values each document is a zero-copy slice of that buffer.
+    Other columns fall back to encoding the string representation of each value.
+
+    Parameters
+    ----------
+    column : pa.ChunkedArray
+        The column to be encoded.
+
+    Returns
+    -------
+    List[Union[bytes, memoryview]]
+        The encoded documents.
+    """
+    documents = []
+
+    for chunk in column.chunks:
+        is_string = pa.types.is_string(chunk.type)
+
+        if chunk.null_count or not (is_string or pa.types.is_large_string(chunk.type)):
+            documents.extend(str(value).encode() for value in chunk.to_pylist())
+            continue
+
+        _, offsets, data = chunk.buffers()
+
+        offsets = np.frombuffer(
+            offsets, 
+            dtype=np.int32 if is_string else np.int64
+        )[chunk.offset:chunk.offset + len(chunk) + 1].tolist()
+
+        data = memoryview(data) if data is not None else memoryview(b"")
+
+        documents.extend(data[start:end] for start, end in zip(offsets, offsets[1:]))
+
+    return documents
+
+
+def _hash_batch(
+    batch: pa.Table, 
+    column_name: str, 
+    hash_column_name: str, 
+    hash_algorithm: str = "sha256", 
+    workers: Optional[int] = None, 
+    cache: Optional[Dict[bytes, str]] = None, 
+    device: str = "cpu"
+) -> pa.Table:
+    """
+    Computes the hash column for a batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    column_name : str
+        The name of the column containing the text to be hashed.
+
+    hash_column_name : str
+        The name of the column to store the hash values.
+
+    hash_algorithm : str, optional
+        The name of the hash algorithm. Default is "sha256".
+
+    workers : int, optional
+        The maximum number of threads used to hash the batch.
+
+    cache : Dict[bytes, str], optional
+        The duplicate cache the digests of repeated short documents are memoized in.
+
+    device : str, optional
+        The device to hash SHA-256 batches on, "cpu" or "cuda". Default is "cpu".
+
+    Returns
+    -------
+    pa.Table
+        The batch with the hash column.
+    """
+    hashes = hash_many(
+        _encoded_documents(batch[column_name]), 
+        algorithm=hash_algorithm, 
+        workers=workers, 
+        cache=cache, 
+        device=device
+    )
+
+    return _set_column(batch, hash_column_name, pa.array(hashes, type=pa.string()))
+
+
+def _uuid_batch(
+    batch: pa.Table, 
+    uuid_column_name: str
+) -> pa.Table:
+    """
+    Computes the UUID column for a batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    uuid_column_name : str
+        The name of the column to store the UUID values.
+
+    Returns
+    -------
+    pa.Table
+        The batch with the UUID column.
+    """
+    return _set_column(batch, uuid_column_name, uuid4_array(batch.num_rows))
+
+
+def _hash_uuid_batch(
+    batch: pa.Table, 
+    column_name: str, 
+    hash_column_name: str, 
+    uuid_column_name: str, 
+    workers: Optional[int] = None
+) -> pa.Table:
+    """
+    Computes both the SHA-256 hash and the UUID columns for a batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    column_name : str
+        The name of the column containing the text to be hashed.
+
+    hash_column_name : str
+        The name of the column to store the hash values.
+
+    uuid_column_name : str
+        The name of the column to store the UUID values.
+
+    workers : int, optional
+        The maximum number of threads used to hash the batch.
+
+    Returns
+    -------
+    pa.Table
+        The batch with the hash and UUID columns.
+    """
+    batch = _hash_batch(batch, column_name, hash_column_name, workers=workers)
+
+    return _uuid_batch(batch, uuid_column_name)
+
+
+def _expression_mask(
+    batch: pa.Table, 
+    expression: pc.Expression
+) -> pa.ChunkedArray:
+    """
+    Evaluates a boolean expression on a batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    expression : pc.Expression
+        The boolean expression to be evaluated.
+
+    Returns
+    -------
+    pa.ChunkedArray
+        The mask of the rows for which the expression is true.
+    """
+    mask = pads.dataset(batch).to_table(columns={"mask": expression}).column("mask")
+
+    return pc.fill_null(mask, False)
+
+
+def _normalize_batch(
+    batch: pa.Table, 
+    column_name: str, 
+    normalized_column_name: str
+) -> pa.Table:
+    """
+    Normalizes the text of a batch by converting to lowercase and stripping leading/trailing whitespace.
+
+    Both steps run as Arrow compute kernels over the UTF-8 buffers of the batch,
+    without creating a Python string per row. The whitespace is trimmed first so that
+    the padding is not lowercased, and batches made only of ASCII text, the common
+    case, are lowercased by the ASCII kernel, which skips UTF-8 decoding.
+
+    The whitespace is always trimmed by the UTF-8 kernel, which strips the same
+    characters as `str.strip()`, including the ASCII separators \x1c to \x1f that
+    the ASCII kernel keeps, so the result of a row does not depend on its batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    column_name : str
+        The name of the column containing the text to be normalized.
+
+    normalized_column_name : str
+        The name of the column to store the normalized text.
+
+    Returns
+    -------
+    pa.Table
+        The batch with the normalized text column.
+    """
+    trimmed = pc.utf8_trim_whitespace(batch[column_name])
+
+    if pc.all(pc.string_is_ascii(trimmed)).as_py() is not False:
+        normalized = pc.ascii_lower(trimmed)
+
+    else:
+        normalized = pc.utf8_lower(trimmed)
+
+    return _set_column(batch, normalized_column_name, normalized)
+
+
+def _constant_batch(
+    batch: pa.Table, 
+    column_name: str, 
+    constant_value
+) -> pa.Table:
+    """
+    Sets a column of a batch to a constant value.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    column_name : str
+        The name of the column to store the constant value.
+
+    constant_value
+        The constant value to be assigned to each row.
+
+    Returns
+    -------
+    pa.Table
+        The batch with the constant value column.
+    """
+    return _set_column(batch, column_name, pa.repeat(constant_value, batch.num_rows))
+
+
+def _convert_batch(
+    batch: pa.Table, 
+    column_name: str, 
+    new_type: Union[type, str], 
+    dtype: Optional[str] = None
+) -> pa.Table:
+    """
+    Converts the values of a column of a batch to a new type.
+
+    The column is cast by Arrow when a `dtype` is given, and converted row by row
+    with `new_type` otherwise or when Arrow refuses the cast.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    column_name : str
+        The name of the column to be converted.
+
+    new_type : Union[type, str]
+        The new data type for the column, e.g., int, float, str, or the name of an Arrow dtype.
+
+    dtype : str, optional
+        The Arrow dtype to cast the column to, if the cast matches `new_type`.
+
+    Returns
+    -------
+    pa.Table
+        The batch with the converted column.
+    """
+    column = batch[column_name]
+
+    # str() turns a missing value into "None", where the cast would keep it missing
+    if dtype is not None and not (new_type is str and column.null_count):
+        try:
+            return _set_column(batch, column_name, column.cast(dtype))
+
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # A dtype name has no Python constructor to fall back on
+            if isinstance(new_type, str):
+                raise
+
+    return _set_column(batch, column_name, pa.array([new_type(value) for value in column.to_pylist()]))
+
+
+def _fill_missing_batch(
+    batch: pa.Table, 
+    column_name: str, 
+    fill_value
+) -> pa.Table:
+    """
+    Fills the missing values of a column of a batch.
+
+    Only the validity bitmap of the column is scanned by the Arrow kernel,
+    the values buffer is left untouched where no value is missing. An integer
+    column filled with a float is promoted to the float type rather than
+    truncating the fill value. Otherwise the fill value must have the type of
+    the column, or be a number that widens to it, e.g. an int into a float column.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    column_name : str
+        The name of the column with missing values to be filled.
+
+    fill_value
+        The value to fill in for missing values.
+
+    Returns
+    -------
+    pa.Table
+        The batch with the filled column.
+    """
+    column = batch[column_name]
+    fill_scalar = pa.scalar(fill_value)
+
+    # A column without any value has no type to fill into yet
+    if pa.types.is_null(column.type):
+        column = column.cast(fill_scalar.type)
+
+    column_type, fill_type = column.type, fill_scalar.type
+
+    # An integer column filled with a fractional value is promoted, as Python values would be
+    if pa.types.is_integer(column_type) and pa.types.is_floating(fill_type):
+        column = column.cast(fill_type)
+
+    # Arrow casts across kinds, e.g. True into "true", so only the same type or a numeric widening is cast
+    elif not (
+        fill_type == column_type 
+        or (pa.types.is_integer(fill_type) and (pa.types.is_integer(column_type) or pa.types.is_floating(column_type))) 
+        or (pa.types.is_floating(fill_type) and pa.types.is_floating(column_type)) 
+        or (pa.types.is_string(fill_type) and pa.types.is_large_string(column_type))
+    ):
+        raise ValueError(f"Cannot fill column '{column_name}' of type {column_type} with {fill_value!r}.")
+
+    try:
+        # The safe cast refuses to overflow the column type, e.g. 300 into an int8 column
+        fill_scalar = fill_scalar.cast(column.type)
+
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as error:
+        raise ValueError(f"Cannot fill column '{column_name}' of type {column_type} with {fill_value!r}.") from error
+
+    return _set_column(batch, column_name, pc.fill_null(column, fill_scalar))
+
+
+def _rename_batch(
+    batch: pa.Table, 
+    old_column_name: str, 
+    new_column_name: str
+) -> pa.Table:
+    """
+    Renames a column of a batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    old_column_name : str
+        The current name of the column to be renamed.
+
+    new_column_name : str
+        The new name for the column.
+
+    Returns
+    -------
+    pa.Table
+        The batch with the renamed column.
+    """
+    return batch.rename_columns([
+        new_column_name if name == old_column_name else name for name in batch.column_names
+    ])
+
+
+def _drop_batch(
+    batch: pa.Table, 
+    column_name: str
+) -> pa.Table:
+    """
+    Drops a column of a batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    column_name : str
+        The name of the column to be dropped.
+
+    Returns
+    -------
+    pa.Table
+        The batch without the column.
+    """
+    return batch.remove_column(batch.column_names.index(column_name))
+
+
+def _fused_batch(
+    batch: pa.Table, 
+    operations: List[Tuple[Callable, Dict[str, Any]]]
+) -> pa.Table:
+    """
+    Applies a sequence of batch functions to a batch.
+
+    Parameters
+    ----------
+    batch : pa.Table
+        The batch of rows, as an Arrow table.
+
+    operations : List[Tuple[Callable, Dict[str, Any]]]
+        The batch functions to be applied in order, with their keyword arguments.
+
+    Returns
+    -------
+    pa.Table
+        The batch once every function has been applied.
+    """
+    for function, fn_kwargs in operations:
+        batch = function(batch, **fn_kwargs)
+
+    return batch
+
+
+def _format_columns(
+    columns: List[str], 
+    operations: List[Tuple[Callable, Dict[str, Any]]]
+) -> List[str]:
+    """
+    Follows the columns of a restricted format through renames and drops.
+
+    Parameters
+    ----------
+    columns : List[str]
+        The columns of the format before the batch functions are applied.
+
+    operations : List[Tuple[Callable, Dict[str, Any]]]
+        The batch functions applied in order, with their keyword arguments.
+
+    Returns
+    -------
+    List[str]
+        The columns of the format, under their new names and without the dropped ones.
+    """
+    for function, fn_kwargs in operations:
+        if function is _rename_batch:
+            columns = [
+                fn_kwargs["new_column_name"] if name == fn_kwargs["old_column_name"] else name 
+                for name in columns
+            ]
+
+        elif function is _drop_batch:
+            columns = [name for name in columns if name != fn_kwargs["column_name"]]
+
+    return columns
+
 
 class DatasetFormatter:
     """
@@ -49,10 +579,25 @@ class DatasetFormatter:
     dataset : datasets.Dataset
         The dataset to be formatted.
 
+    batch_size : int, optional
+        The number of rows handed to each batched `map` call. Default is 1000.
+
+    num_proc : int, optional
+        The number of processes used by `map` and `filter`. Defaults to the number of CPUs.
+
+    eager : bool, optional
+        If True, each method returns a new dataset. If False, the column transforms are
+        recorded and return the formatter, and `build` applies them in a single pass.
+        Default is True.
+
+    prefetch : int, optional
+        The number of batches read ahead by a background thread while `hash` hashes the
+        current one. If 0, `hash` runs a batched `map` instead. Default is 0.
+
     Methods
     -------
-    hash(column_name: str = "document", hash_column_name: str = "hash") -> datasets.Dataset
-        Creates a SHA-256 hash column for the dataset.
+    hash(column_name: str = "document", hash_column_name: str = "hash", cache_duplicates: bool = False, hash_algorithm: str = "sha256", device: str = "cpu") -> datasets.Dataset
+        Creates a SHA-256 (or BLAKE3, XXH3) hash column for the dataset.
     
     uuid(uuid_column_name: str = "uuid") -> datasets.Dataset
         Adds a UUID column to the dataset.
@@ -63,6 +608,9 @@ class DatasetFormatter:
     filter_rows(condition: Callable) -> datasets.Dataset
         Filters rows based on a given condition.
     
+    filter_expr(expression: pc.Expression) -> datasets.Dataset
+        Filters rows based on a PyArrow compute expression.
+    
     rename_column(old_column_name: str, new_column_name: str) -> datasets.Dataset
         Renames a column in the dataset.
     
@@ -81,12 +629,19 @@ class DatasetFormatter:
     compute_summary(column_name: str) -> Dict[str, float]
         Computes summary statistics for a numerical column.
     
+    build() -> datasets.Dataset
+        Applies the recorded transforms to the dataset in a single pass.
+    
     __call__(hash_column_name: str = "hash", uuid_column_name: str = "uuid") -> datasets.Dataset
         Applies both the hash and UUID functions to the dataset.
     """
     def __init__(
         self, 
-        dataset: datasets.Dataset
+        dataset: datasets.Dataset, 
+        batch_size: int = 1000, 
+        num_proc: Optional[int] = None, 
+        eager: bool = True, 
+        prefetch: int = 0
     ):
         """
         Initializes the DatasetFormatter with a dataset.
@@ -95,11 +650,326 @@ class DatasetFormatter:
         ----------
         dataset : datasets.Dataset
             The dataset to be formatted.
+
+        batch_size : int, optional
+            The number of rows handed to each batched `map` call. Default is 1000.
+
+        num_proc : int, optional
+            The number of processes used by `map` and `filter`. Defaults to the number of CPUs.
+
+        eager : bool, optional
+            If False, the column transforms are recorded until `build` is called. Default is True.
+
+        prefetch : int, optional
+            The number of batches read ahead while `hash` hashes the current one. Default is 0.
         """
         if not isinstance(dataset, datasets.Dataset):
             raise TypeError("Expected a Hugging Face `datasets.Dataset` object.")
 
         self.dataset = dataset
+        self.batch_size = batch_size
+        self.num_proc = num_proc or os.cpu_count() or 1
+        self.eager = eager
+        self.prefetch = prefetch
+        self._ops = []
+        self._single_process = False
+
+
+    @property
+    def dataset(
+        self
+    ) -> datasets.Dataset:
+        """
+        The dataset to be formatted.
+
+        Methods return new datasets and leave this one untouched, except `__call__`
+        and `build` which store their result here.
+
+        Returns
+        -------
+        datasets.Dataset
+            The dataset to be formatted.
+        """
+        return self._dataset
+
+
+    @dataset.setter
+    def dataset(
+        self, 
+        dataset: datasets.Dataset
+    ):
+        """
+        Sets the dataset to be formatted and caches its column names.
+
+        `datasets.Dataset.column_names` rebuilds a list from the Arrow schema on every
+        access, so the column checks of each method look names up in a set instead.
+
+        Parameters
+        ----------
+        dataset : datasets.Dataset
+            The dataset to be formatted.
+        """
+        self._dataset = dataset
+        self._colset = set(dataset.column_names)
+
+
+    def _num_proc(
+        self
+    ) -> int:
+        """
+        Returns the number of processes worth spawning for the current dataset.
+
+        No more processes are used than there are batches, and each process is given
+        at least `_MIN_ROWS_PER_PROCESS` rows, so that datasets the Arrow kernels go
+        through faster than a worker spawns are processed in the current process.
+
+        Returns
+        -------
+        int
+            The number of processes.
+        """
+        num_batches = -(-len(self.dataset) // self.batch_size)
+
+        return max(1, min(self.num_proc, num_batches, len(self.dataset) // _MIN_ROWS_PER_PROCESS))
+
+
+    def _map_batched(
+        self, 
+        function: Callable, 
+        single_process: bool = False, 
+        **fn_kwargs
+    ) -> datasets.Dataset:
+        """
+        Applies an Arrow batch function to the dataset.
+
+        Batches are handed to `function` as Arrow tables and the returned tables are
+        written back as is, so `datasets` neither builds a dict of Python lists per
+        batch nor infers the types of the returned columns from Python values.
+
+        Parameters
+        ----------
+        function : Callable
+            A function that takes an Arrow table and returns the whole updated table.
+
+        single_process : bool, optional
+            If True, the batches are processed in the current process whatever `num_proc`
+            is, e.g. because `function` uses a CUDA context that does not survive a fork.
+            Default is False.
+
+        **fn_kwargs
+            Keyword arguments passed to `function`.
+
+        Returns
+        -------
+        datasets.Dataset
+            The dataset with the columns returned by `function`.
+        """
+        num_proc = 1 if single_process else self._num_proc()
+
+        dataset = self.dataset.with_format("arrow").map(
+            function,
+            fn_kwargs=fn_kwargs,
+            batched=True,
+            batch_size=self.batch_size,
+            num_proc=num_proc if num_proc > 1 else None
+        )
+
+        operations = fn_kwargs["operations"] if function is _fused_batch else [(function, fn_kwargs)]
+
+        return self._restore_format(dataset, operations)
+
+
+    def _restore_format(
+        self, 
+        dataset: datasets.Dataset, 
+        operations: Optional[List[Tuple[Callable, Dict[str, Any]]]] = None
+    ) -> datasets.Dataset:
+        """
+        Applies the format of the formatter's dataset to a dataset derived from it.
+
+        Parameters
+        ----------
+        dataset : datasets.Dataset
+            The derived dataset, e.g. the output of an Arrow-formatted `map` or `filter`.
+
+        operations : List[Tuple[Callable, Dict[str, Any]]], optional
+            The batch functions that derived the dataset, so that the columns of a restricted
+            format follow their renames and drops, as `datasets` does for its own transforms.
+
+        Returns
+        -------
+        datasets.Dataset
+            The derived dataset, with the original format.
+        """
+        dataset_format = self.dataset.format
+        columns = dataset_format["columns"]
+
+        # An unrestricted format must keep exposing the columns added by the transform
+        if columns is not None and set(columns) == set(self.dataset.column_names):
+            columns = None
+
+        elif columns is not None and operations:
+            columns = _format_columns(columns, operations)
+
+        return dataset.with_format(
+            dataset_format["type"],
+            columns=columns,
+            output_all_columns=dataset_format["output_all_columns"],
+            **dataset_format["format_kwargs"]
+        )
+
+
+    def _apply(
+        self, 
+        function: Callable, 
+        single_process: bool = False, 
+        **fn_kwargs
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
+        """
+        Applies an Arrow batch function to the dataset, or records it when the formatter is lazy.
+
+        A recorded function is run once on an empty batch, so that invalid arguments
+        fail immediately and later methods can check the columns it produces.
+
+        Parameters
+        ----------
+        function : Callable
+            A function that takes an Arrow table and returns the whole updated table.
+
+        single_process : bool, optional
+            If True, the batches are processed in the current process, and so is the
+            fused pass of `build` when the function is recorded. Default is False.
+
+        **fn_kwargs
+            Keyword arguments passed to `function`.
+
+        Returns
+        -------
+        Union[datasets.Dataset, DatasetFormatter]
+            The transformed dataset, or the formatter itself if it is lazy.
+        """
+        if self.eager:
+            return self._map_batched(function, single_process=single_process, **fn_kwargs)
+
+        if not self._ops:
+            self._preview = self.dataset.with_format("arrow")[:0]
+
+        self._preview = function(self._preview, **fn_kwargs)
+        self._colset = set(self._preview.column_names)
+        self._ops.append((function, fn_kwargs))
+        self._single_process = self._single_process or single_process
+
+        return self
+
+
+    def _check_built(
+        self, 
+        method_name: str
+    ):
+        """
+        Ensures that no recorded transform is pending before applying a method that cannot be fused.
+
+        Parameters
+        ----------
+        method_name : str
+            The name of the method about to be applied.
+        """
+        if self._ops:
+            raise RuntimeError(f"Call `build()` before `{method_name}`, {len(self._ops)} transforms are pending.")
+
+
+    def build(
+        self
+    ) -> datasets.Dataset:
+        """
+        Applies the recorded transforms to the dataset in a single batched pass.
+
+        Every batch goes through all the transforms before being written back, so a
+        pipeline of K methods rewrites the underlying Arrow table once instead of K times.
+
+        Returns
+        -------
+        datasets.Dataset
+            The transformed dataset, which also replaces the formatter's dataset.
+        """
+        if self._ops:
+            operations, self._ops = self._ops, []
+            single_process, self._single_process = self._single_process, False
+
+            self.dataset = self._map_batched(
+                _fused_batch,
+                single_process=single_process,
+                operations=operations
+            )
+
+        return self.dataset
+
+
+    def _prefetched_hash(
+        self, 
+        column_name: str, 
+        hash_column_name: str, 
+        hash_algorithm: str = "sha256", 
+        cache: Optional[Dict[bytes, str]] = None, 
+        device: str = "cpu"
+    ) -> datasets.Dataset:
+        """
+        Adds a hash column to the dataset, reading the batches ahead of the hashing.
+
+        Only the column to be hashed is read. A background thread pages each batch in and
+        extracts its documents while the previous batch is hashed, so on slow storage the
+        throughput is bounded by the slower of the two rather than by their sum.
+
+        Parameters
+        ----------
+        column_name : str
+            The name of the column containing the text to be hashed.
+
+        hash_column_name : str
+            The name of the new column to store the hash values.
+
+        hash_algorithm : str, optional
+            The name of the hash algorithm. Default is "sha256".
+
+        cache : Dict[bytes, str], optional
+            The duplicate cache the digests of repeated short documents are memoized in.
+
+        device : str, optional
+            The device to hash SHA-256 batches on, "cpu" or "cuda". Default is "cpu".
+
+        Returns
+        -------
+        datasets.Dataset
+            The dataset with the added hash column.
+        """
+        batches = self.dataset.with_format("arrow", columns=[column_name]).iter(batch_size=self.batch_size)
+        documents = prefetch(
+            (_encoded_documents(batch[column_name]) for batch in batches), 
+            depth=self.prefetch
+        )
+
+        hashes = pa.chunked_array(
+            [
+                pa.array(
+                    hash_many(
+                        batch, 
+                        algorithm=hash_algorithm, 
+                        cache=cache, 
+                        device=device
+                    ), 
+                    type=pa.string()
+                )
+                for batch in documents
+            ],
+            type=pa.string()
+        )
+
+        dataset = self.dataset
+
+        if hash_column_name in self._colset:
+            dataset = dataset.remove_columns([hash_column_name])
+
+        return dataset.add_column(hash_column_name, hashes)
 
 
     @memory(print_report=True)
@@ -107,8 +977,11 @@ class DatasetFormatter:
     def hash(
         self, 
         column_name: str = "document", 
-        hash_column_name: str = "hash"
-    ) -> datasets.Dataset:
+        hash_column_name: str = "hash", 
+        cache_duplicates: bool = False, 
+        hash_algorithm: str = "sha256", 
+        device: str = "cpu"
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Adds a SHA-256 hash column to the dataset.
 
@@ -116,6 +989,9 @@ class DatasetFormatter:
         converts it to a string, encodes it in UTF-8, and then generates a SHA-256 hash of
         the encoded text.
 
+        When the hash only identifies or deduplicates rows and cryptographic strength is
+        not required, BLAKE3 or XXH3 can be selected instead; both are several times faster.
+
         Parameters
         ----------
         column_name : str, optional
@@ -124,35 +1000,78 @@ class DatasetFormatter:
         hash_column_name : str, optional
             The name of the new column to store the hash values. Default is "hash".
 
+        cache_duplicates : bool, optional
+            If True, the digests of short documents are memoized for the whole call so that
+            repeated documents (boilerplate clauses, standard recitals) are hashed only once.
+            The memo is released when the call returns, or after `build` if the formatter is
+            not eager. With several processes, each keeps its own memo for the batches it
+            hashes. This only pays off on corpora with a high duplication rate. Default is False.
+
+        hash_algorithm : str, optional
+            The hash algorithm, one of "sha256", "blake3" (requires the `blake3` package)
+            or "xxh3_128" (requires the `xxhash` package). Default is "sha256".
+
+        device : str, optional
+            The device to hash on, "cpu" or "cuda" (requires the `cupy` package and a CUDA
+            device, SHA-256 only). Only batches of at least 10,000 documents are sent to the
+            device, so `batch_size` should be raised accordingly. Probing the device initializes
+            CUDA in the current process, where a forked worker could not use it, so the batches
+            are then hashed in the current process whatever `num_proc` is. Falls back to the CPU
+            when no device is available. Default is "cpu".
+
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with the added hash column.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        def generate_hash(
-            text: str
-        ) -> str:
-            """
-            Generate a SHA-256 hash for a given text.
+        if column_name not in self._colset:
+            raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
 
-            Parameters
-            ----------
-            text : str
-                The text content to be hashed.
+        if device not in HASH_DEVICES:
+            raise ValueError(f"Unsupported device '{device}', expected one of {HASH_DEVICES}.")
 
-            Returns
-            -------
-            str
-                The SHA-256 hash of the input text, represented as a hexadecimal string.
-            """
-            return hashlib.sha256(str(text).encode()).hexdigest()
+        if device == "cuda" and hash_algorithm != "sha256":
+            raise ValueError("Only the 'sha256' hash algorithm can be computed on a CUDA device.")
 
+        # Fail early on an unknown algorithm or a missing optional backend
+        hasher(hash_algorithm)
 
-        if column_name not in self.dataset.column_names:
-            raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
+        if device == "cuda" and not cuda_available():
+            logger.warning("No CUDA device is available through `cupy`, hashing on the CPU.")
+            device = "cpu"
 
-        # Apply the hash generation to each row in the dataset
-        return self.dataset.map(lambda x: {hash_column_name: generate_hash(x[column_name])})
+        # Shared by every batch hashed in this process, a recorded transform keeps it until `build`
+        cache = {} if cache_duplicates else None
+
+        try:
+            if self.eager and self.prefetch > 0:
+                return self._prefetched_hash(
+                    column_name,
+                    hash_column_name,
+                    hash_algorithm=hash_algorithm,
+                    cache=cache,
+                    device=device
+                )
+
+            # A CUDA context initialized here cannot be used by forked workers
+            single_process = device == "cuda"
+
+            # Apply the hash generation to each batch of rows in the dataset
+            return self._apply(
+                _hash_batch,
+                single_process=single_process,
+                column_name=column_name,
+                hash_column_name=hash_column_name,
+                hash_algorithm=hash_algorithm,
+                workers=(os.cpu_count() or 1) // (1 if single_process else self._num_proc()),
+                cache=cache,
+                device=device
+            )
+
+        finally:
+            if cache is not None and self.eager:
+                cache.clear()
 
 
     @memory(print_report=True)
@@ -160,7 +1079,7 @@ class DatasetFormatter:
     def uuid(
         self, 
         uuid_column_name: str = "uuid"
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Adds a UUID column to the dataset.
 
@@ -174,11 +1093,15 @@ class DatasetFormatter:
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with the added UUID column.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        # Apply the UUID generation to each row in the dataset
-        return self.dataset.map(lambda x: {uuid_column_name: str(uuid.uuid4())})
+        # Apply the UUID generation to each batch of rows in the dataset
+        return self._apply(
+            _uuid_batch,
+            uuid_column_name=uuid_column_name
+        )
 
 
     @memory(print_report=True)
@@ -187,7 +1110,7 @@ class DatasetFormatter:
         self, 
         column_name: str, 
         normalized_column_name: Optional[str] = None
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Normalizes text in a specified column by converting to lowercase and stripping whitespace.
 
@@ -201,35 +1124,21 @@ class DatasetFormatter:
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with the normalized text column.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        def normalize(
-            text: str
-        ) -> str:
-            """
-            Normalize the text by converting to lowercase and stripping leading/trailing whitespace.
-
-            Parameters
-            ----------
-            text : str
-                The text content to be normalized.
-
-            Returns
-            -------
-            str
-                The normalized text.
-            """
-            return text.lower().strip()
-
-
-        if column_name not in self.dataset.column_names:
+        if column_name not in self._colset:
             raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
 
         new_column_name = normalized_column_name if normalized_column_name else column_name
 
-        # Apply text normalization to each row in the dataset
-        return self.dataset.map(lambda x: {new_column_name: normalize(x[column_name])})
+        # Apply text normalization to each batch of rows in the dataset
+        return self._apply(
+            _normalize_batch,
+            column_name=column_name,
+            normalized_column_name=new_column_name
+        )
 
 
     @memory(print_report=True)
@@ -250,16 +1159,72 @@ class DatasetFormatter:
         -------
         datasets.Dataset
             The filtered dataset.
+
+        Notes
+        -----
+        The condition is evaluated in Python for every row. When it can be written as a
+        `pyarrow.compute.Expression`, prefer `filter_expr`, e.g.
+        `filter_expr(pc.match_substring(pc.field("document"), "Another"))`
+        instead of `filter_rows(lambda x: "Another" in x["document"])`.
         """
+        self._check_built("filter_rows")
+
         # Apply row filtering based on the condition
-        return self.dataset.filter(condition)
+        num_proc = self._num_proc()
+
+        return self.dataset.filter(
+            condition,
+            num_proc=num_proc if num_proc > 1 else None
+        )
+
+
+    @memory(print_report=True)
+    @timer(print_time=True)
+    def filter_expr(
+        self, 
+        expression: pc.Expression
+    ) -> datasets.Dataset:
+        """
+        Filters rows based on a PyArrow compute expression.
+
+        The expression is evaluated by vectorized Arrow kernels on each batch of rows,
+        instead of calling a Python function per row as `filter_rows` does.
+
+        Parameters
+        ----------
+        expression : pc.Expression
+            A boolean expression over the columns of the dataset, 
+            e.g. `pc.match_substring(pc.field("document"), "Another")`.
+            Rows for which the expression is null are dropped.
+
+        Returns
+        -------
+        datasets.Dataset
+            The filtered dataset.
+        """
+        if not isinstance(expression, pc.Expression):
+            raise TypeError("Expected a `pyarrow.compute.Expression` object.")
+
+        self._check_built("filter_expr")
+
+        num_proc = self._num_proc()
+
+        dataset = self.dataset.with_format("arrow").filter(
+            _expression_mask,
+            fn_kwargs={"expression": expression},
+            batched=True,
+            batch_size=self.batch_size,
+            num_proc=num_proc if num_proc > 1 else None
+        )
+
+        return self._restore_format(dataset)
 
 
     def rename_column(
         self, 
         old_column_name: str, 
         new_column_name: str
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Renames a column in the dataset.
 
@@ -273,12 +1238,20 @@ class DatasetFormatter:
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with the renamed column.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        if old_column_name not in self.dataset.column_names:
+        if old_column_name not in self._colset:
             raise ValueError(f"Column '{old_column_name}' does not exist in the dataset.")
 
+        if not self.eager:
+            return self._apply(
+                _rename_batch,
+                old_column_name=old_column_name,
+                new_column_name=new_column_name
+            )
+
         # Rename the column
         return self.dataset.rename_column(old_column_name, new_column_name)
 
@@ -286,7 +1259,7 @@ class DatasetFormatter:
     def drop_column(
         self, 
         column_name: str
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Drops a specified column from the dataset.
 
@@ -297,12 +1270,16 @@ class DatasetFormatter:
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with the specified column dropped.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        if column_name not in self.dataset.column_names:
+        if column_name not in self._colset:
             raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
 
+        if not self.eager:
+            return self._apply(_drop_batch, column_name=column_name)
+
         # Drop the column
         return self.dataset.remove_columns([column_name])
 
@@ -311,10 +1288,13 @@ class DatasetFormatter:
         self, 
         column_name: str, 
         constant_value
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Adds a new column with a constant value.
 
+        A new column is appended next to the existing Arrow table, which is not rewritten.
+        If the column already exists, its values are overwritten.
+
         Parameters
         ----------
         column_name : str
@@ -325,11 +1305,23 @@ class DatasetFormatter:
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with the new constant value column.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        # Add the constant value column
-        return self.dataset.map(lambda x: {column_name: constant_value})
+        if column_name in self._colset or not self.eager:
+            # Overwrite the existing column in place
+            return self._apply(
+                _constant_batch,
+                column_name=column_name,
+                constant_value=constant_value
+            )
+
+        # Append the constant value column, built by Arrow without a Python list
+        return self.dataset.add_column(
+            column_name, 
+            pa.repeat(constant_value, len(self.dataset))
+        )
 
 
     @memory(print_report=True)
@@ -338,7 +1330,7 @@ class DatasetFormatter:
         self, 
         column_name: str, 
         new_type: Union[type, str]
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Converts a column to a specified data type.
 
@@ -348,18 +1340,62 @@ class DatasetFormatter:
             The name of the column to be converted.
         
         new_type : Union[type, str]
-            The new data type for the column, e.g., int, float, str.
+            The new data type for the column, e.g., int, float, str, or the name of
+            a `datasets.Value` dtype, e.g., "int32", "float32", "string".
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with the converted column.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
+
+        Notes
+        -----
+        int, float and str (from integer or string columns) as well as dtype names are
+        converted by a vectorized Arrow cast. Other callables, values Arrow refuses to
+        cast (e.g. truncating 1.5 to an int) and batches with missing values converted
+        to str (which become "None") are converted row by row in Python.
         """
-        if column_name not in self.dataset.column_names:
+        if column_name not in self._colset:
             raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
 
-        # Apply the type conversion to each row in the dataset
-        return self.dataset.map(lambda x: {column_name: new_type(x[column_name])})
+        if isinstance(new_type, str):
+            dtype = new_type
+
+        else:
+            dtype = _ARROW_CAST_TYPES.get(new_type)
+            schema = self._preview.schema if self._ops else self.dataset.data.schema
+            column_type = schema.field(column_name).type
+
+            # Arrow formats floats and booleans differently from str(), e.g. "1" and "true"
+            if new_type is str and not (
+                pa.types.is_integer(column_type) 
+                or pa.types.is_string(column_type) 
+                or pa.types.is_large_string(column_type)
+            ):
+                dtype = None
+
+        if (
+            self.eager 
+            and dtype is not None 
+            and not (new_type is str and self.dataset.data.column(column_name).null_count)
+        ):
+            try:
+                return self.dataset.cast_column(column_name, datasets.Value(dtype))
+
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                if isinstance(new_type, str):
+                    raise
+
+                dtype = None
+
+        # Apply the type conversion to each batch of rows in the dataset
+        return self._apply(
+            _convert_batch,
+            column_name=column_name,
+            new_type=new_type,
+            dtype=dtype
+        )
 
 
     @memory(print_report=True)
@@ -368,7 +1404,7 @@ class DatasetFormatter:
         self, 
         column_name: str, 
         fill_value
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Fills missing values in a column with a specified value.
 
@@ -382,14 +1418,19 @@ class DatasetFormatter:
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with missing values filled.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        if column_name not in self.dataset.column_names:
+        if column_name not in self._colset:
             raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
 
         # Fill missing values in the column
-        return self.dataset.map(lambda x: {column_name: x[column_name] if x[column_name] is not None else fill_value})
+        return self._apply(
+            _fill_missing_batch,
+            column_name=column_name,
+            fill_value=fill_value
+        )
 
 
     @memory(print_report=True)
@@ -401,6 +1442,12 @@ class DatasetFormatter:
         """
         Computes summary statistics for a numerical column.
 
+        The mean and standard deviation are computed by Arrow compute kernels directly on
+        the column buffers, one chunk at a time. The median is exact for columns of up to a
+        million values, which costs a sorted copy of the column (at most about 8 MB), and is
+        approximated with a t-digest, which keeps a bounded sketch, for larger columns.
+        Missing values are skipped and booleans count as 0 and 1.
+
         Parameters
         ----------
         column_name : str
@@ -411,15 +1458,28 @@ class DatasetFormatter:
         Dict[str, float]
             A dictionary containing summary statistics (mean, median, std) for the column.
         """
-        if column_name not in self.dataset.column_names:
+        if column_name not in self._colset:
             raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
 
-        column_data = np.array(self.dataset[column_name])
+        self._check_built("compute_summary")
+
+        # Arrow-formatted access returns the memory-mapped column without copying it
+        column_data = self.dataset.with_format("arrow")[column_name]
+
+        # The quantile kernels have no boolean implementation, count True as 1 as NumPy does
+        if pa.types.is_boolean(column_data.type):
+            column_data = column_data.cast(pa.int8())
+
+        if len(column_data) <= _EXACT_MEDIAN_MAX_SIZE:
+            median = pc.quantile(column_data, q=0.5)[0].as_py()
+
+        else:
+            median = pc.approximate_median(column_data).as_py()
 
         summary = {
-            "mean": np.mean(column_data),
-            "median": np.median(column_data),
-            "std": np.std(column_data)
+            "mean": pc.mean(column_data).as_py(),
+            "median": median,
+            "std": pc.stddev(column_data, ddof=0).as_py()
         }
 
         return summary
@@ -431,11 +1491,12 @@ class DatasetFormatter:
         self, 
         hash_column_name: str = "hash", 
         uuid_column_name: str = "uuid"
-    ) -> datasets.Dataset:
+    ) -> Union[datasets.Dataset, "DatasetFormatter"]:
         """
         Applies both the hash and UUID functions to the dataset.
 
-        This method first adds a SHA-256 hash column and then adds a UUID column to the dataset.
+        Both columns are computed in a single pass over the "document" column, so the
+        underlying Arrow table is rewritten only once.
 
         Parameters
         ----------
@@ -447,12 +1508,27 @@ class DatasetFormatter:
 
         Returns
         -------
-        datasets.Dataset
+        Union[datasets.Dataset, DatasetFormatter]
             The dataset with both hash and UUID columns.
+            If the formatter is not eager, the transform is recorded and the formatter is returned.
         """
-        # Add the hash column
-        self.dataset = self.hash(hash_column_name=hash_column_name)
-        # Add the UUID column
-        self.dataset = self.uuid(uuid_column_name=uuid_column_name)
+        column_name = "document"
+
+        if column_name not in self._colset:
+            raise ValueError(f"Column '{column_name}' does not exist in the dataset.")
+
+        # Add the hash and UUID columns in the same batched pass
+        result = self._apply(
+            _hash_uuid_batch,
+            column_name=column_name,
+            hash_column_name=hash_column_name,
+            uuid_column_name=uuid_column_name,
+            workers=(os.cpu_count() or 1) // self._num_proc()
+        )
+
+        if not self.eager:
+            return result
+
+        self.dataset = result
         
         return self.dataset
\ No newline at end of file
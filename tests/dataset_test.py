@@ -25,8 +25,10 @@ from typing import (
 )
 
 import hashlib
+import sys
 import uuid
 import datasets
+import pyarrow.compute as pc
 import pytest
 
 from datasets import Dataset
@@ -87,6 +89,127 @@ def test_hash(
     assert formatted_dataset[0]["hash"] == expected_hash
 
 
+def test_hash_cache_duplicates(
+    monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test the `hash` method of `DatasetFormatter` with the duplicate cache enabled.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        The pytest fixture used to count the documents actually hashed.
+
+    Asserts
+    -------
+    Asserts that repeated documents get the same SHA-256 hash values as without the cache,
+    and that a document repeated in another batch is hashed only once.
+    """
+    data = {
+        "document": [
+            "This is a test document.", 
+            "Another test document.", 
+            "This is a test document."
+        ]
+    }
+    dataset = datasets.Dataset.from_dict(data)
+    formatter = DatasetFormatter(dataset, batch_size=1)
+
+    hashing = sys.modules[sys.modules[DatasetFormatter.__module__].hash_many.__module__]
+    hashed_documents = []
+
+    def sha256(document):
+        hashed_documents.append(bytes(document))
+
+        return hashlib.sha256(document)
+
+    monkeypatch.setattr(hashing, "hasher", lambda algorithm: sha256)
+
+    formatted_dataset = formatter.hash(
+        column_name="document", 
+        hash_column_name="hash", 
+        cache_duplicates=True
+    )
+
+    expected_hashes = [
+        hashlib.sha256(document.encode()).hexdigest()
+        for document in data["document"]
+    ]
+
+    assert formatted_dataset["hash"] == expected_hashes
+    assert len(hashed_documents) == 2
+
+
+@pytest.mark.parametrize(
+    "hash_algorithm, module_name", 
+    [
+        ("blake3", "blake3"), 
+        ("xxh3_128", "xxhash")
+    ]
+)
+def test_hash_algorithm(
+    sample_dataset: Dataset, 
+    hash_algorithm: str, 
+    module_name: str
+):
+    """
+    Test the `hash` method of `DatasetFormatter` with non-cryptographic hash algorithms.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    hash_algorithm : str
+        The name of the hash algorithm.
+
+    module_name : str
+        The name of the optional package providing the algorithm.
+
+    Asserts
+    -------
+    Asserts that the hash column holds the digests of the selected algorithm.
+    """
+    module = pytest.importorskip(module_name)
+    formatter = DatasetFormatter(sample_dataset)
+
+    formatted_dataset = formatter.hash(
+        column_name="document", 
+        hash_column_name="hash", 
+        hash_algorithm=hash_algorithm
+    )
+
+    expected_hash = getattr(module, hash_algorithm)(
+        "This is a test document.".encode()
+    ).hexdigest()
+
+    assert formatted_dataset[0]["hash"] == expected_hash
+
+
+def test_hash_unsupported_algorithm(
+    sample_dataset: Dataset
+):
+    """
+    Test the `hash` method of `DatasetFormatter` with an unsupported hash algorithm.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    Asserts
+    -------
+    Asserts that a ValueError is raised.
+    """
+    formatter = DatasetFormatter(sample_dataset)
+
+    with pytest.raises(ValueError):
+        formatter.hash(
+            column_name="document", 
+            hash_algorithm="md5"
+        )
+
+
 def test_uuid(
     sample_dataset: Dataset
 ):
@@ -109,6 +232,8 @@ def test_uuid(
 
     assert "uuid" in formatted_dataset.column_names
     assert len(formatted_dataset[0]["uuid"]) == 36  # UUID length
+    assert uuid.UUID(formatted_dataset[0]["uuid"]).version == 4
+    assert formatted_dataset[0]["uuid"] != formatted_dataset[1]["uuid"]
 
 
 def test_normalize_text(
@@ -160,6 +285,30 @@ def test_filter_rows(
     assert formatted_dataset[0]["document"] == "Another test document."
 
 
+def test_filter_expr(
+    sample_dataset: Dataset
+):
+    """
+    Test the `filter_expr` method of `DatasetFormatter`.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    Asserts
+    -------
+    Asserts that rows are correctly filtered based on the expression.
+    """
+    formatter = DatasetFormatter(sample_dataset)
+    formatted_dataset = formatter.filter_expr(
+        pc.match_substring(pc.field("document"), "Another")
+    )
+
+    assert len(formatted_dataset) == 1
+    assert formatted_dataset[0]["document"] == "Another test document."
+
+
 def test_rename_column(
     sample_dataset: Dataset
 ):
@@ -265,6 +414,57 @@ def test_convert_column_type(
     assert isinstance(formatted_dataset[0]["number_str"], int)
 
 
+def test_convert_column_type_fallback():
+    """
+    Test the `convert_column_type` method of `DatasetFormatter` when Arrow cannot cast the column.
+
+    Asserts
+    -------
+    Asserts that the column is converted with the Python constructor instead.
+    """
+    data = {
+        "float_column": [1.5, 2.7]
+    }
+    dataset = datasets.Dataset.from_dict(data)
+    formatter = DatasetFormatter(dataset)
+    formatted_dataset = formatter.convert_column_type(
+        column_name="float_column", 
+        new_type=int
+    )
+
+    assert formatted_dataset["float_column"] == [1, 2]
+
+
+@pytest.mark.parametrize("eager", [True, False])
+def test_convert_column_type_str_missing(
+    eager: bool
+):
+    """
+    Test the `convert_column_type` method of `DatasetFormatter` to str on a column with missing values.
+
+    Parameters
+    ----------
+    eager : bool
+        Whether the conversion is applied immediately or through `build`.
+
+    Asserts
+    -------
+    Asserts that missing values are converted like `str(None)`.
+    """
+    dataset = datasets.Dataset.from_dict({"int_column": [1, None]})
+    formatter = DatasetFormatter(dataset, eager=eager)
+
+    formatted_dataset = formatter.convert_column_type(
+        column_name="int_column", 
+        new_type=str
+    )
+
+    if not eager:
+        formatted_dataset = formatter.build()
+
+    assert formatted_dataset["int_column"] == ["1", "None"]
+
+
 def test_fill_missing():
     """
     Test the `fill_missing` method of `DatasetFormatter`.
@@ -285,6 +485,62 @@ def test_fill_missing():
 
     assert formatted_dataset[1]["some_column"] == 0
 
+
+def test_fill_missing_promotes_int():
+    """
+    Test the `fill_missing` method of `DatasetFormatter` on an int column filled with a float.
+
+    Asserts
+    -------
+    Asserts that the column is promoted to float instead of truncating the fill value.
+    """
+    dataset = datasets.Dataset.from_dict({"n": [1, None]})
+    formatter = DatasetFormatter(dataset)
+    formatted_dataset = formatter.fill_missing(
+        column_name="n", 
+        fill_value=0.5
+    )
+
+    assert formatted_dataset["n"] == [1.0, 0.5]
+    assert formatted_dataset.features["n"] == datasets.Value("float64")
+
+
+@pytest.mark.parametrize(
+    "values, fill_value", 
+    [
+        (["a", None], True), 
+        ([1.5, None], "2")
+    ]
+)
+def test_fill_missing_mismatched_type(
+    values: list, 
+    fill_value
+):
+    """
+    Test the `fill_missing` method of `DatasetFormatter` with a fill value of another kind than the column.
+
+    Parameters
+    ----------
+    values : list
+        The values of the column, with a missing one.
+
+    fill_value
+        A fill value that does not fit the column type.
+
+    Asserts
+    -------
+    Asserts that the fill value is rejected instead of being converted, e.g. True into "true".
+    """
+    dataset = datasets.Dataset.from_dict({"column": values})
+    formatter = DatasetFormatter(dataset)
+
+    with pytest.raises(ValueError):
+        formatter.fill_missing(
+            column_name="column", 
+            fill_value=fill_value
+        )
+
+
 def test_compute_summary():
     """
     Test the `compute_summary` method of `DatasetFormatter`.
@@ -308,6 +564,49 @@ def test_compute_summary():
     assert summary_stats["std"] == pytest.approx(1.414, 0.001)
 
 
+def test_compute_summary_boolean():
+    """
+    Test the `compute_summary` method of `DatasetFormatter` on a boolean column.
+
+    Asserts
+    -------
+    Asserts that True counts as 1 and False as 0.
+    """
+    dataset = datasets.Dataset.from_dict({"flag": [True, False]})
+    formatter = DatasetFormatter(dataset)
+
+    summary_stats = formatter.compute_summary(
+        column_name="flag"
+    )
+
+    assert summary_stats == {"mean": 0.5, "median": 0.5, "std": 0.5}
+
+
+def test_compute_summary_chunked():
+    """
+    Test the `compute_summary` method of `DatasetFormatter` on a column spread over several Arrow chunks.
+
+    Asserts
+    -------
+    Asserts that the statistics combine every chunk and skip missing values.
+    """
+    dataset = datasets.concatenate_datasets(
+        [
+            datasets.Dataset.from_dict({"numerical_column": [1, 2, 3]}), 
+            datasets.Dataset.from_dict({"numerical_column": [4, 5, None]})
+        ]
+    )
+    formatter = DatasetFormatter(dataset)
+
+    summary_stats = formatter.compute_summary(
+        column_name="numerical_column"
+    )
+
+    assert summary_stats["mean"] == 3.0
+    assert summary_stats["median"] == 3.0
+    assert summary_stats["std"] == pytest.approx(1.414, 0.001)
+
+
 def test_call(
     sample_dataset: Dataset
 ):
@@ -338,3 +637,297 @@ def test_call(
 
     assert formatted_dataset[0]["hash"] == expected_hash
     assert len(formatted_dataset[0]["uuid"]) == 36  # UUID length
+
+
+def test_call_num_proc(
+    sample_dataset: Dataset, 
+    monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test the `__call__` method of `DatasetFormatter` with several processes.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    monkeypatch : pytest.MonkeyPatch
+        The pytest fixture used to spread the two rows over two processes.
+
+    Asserts
+    -------
+    Asserts that hash and UUID columns are correctly added when batches are spread over processes.
+    """
+    monkeypatch.setattr(sys.modules[DatasetFormatter.__module__], "_MIN_ROWS_PER_PROCESS", 1)
+
+    formatter = DatasetFormatter(
+        sample_dataset, 
+        batch_size=1, 
+        num_proc=2
+    )
+    formatted_dataset = formatter(
+        hash_column_name="hash", 
+        uuid_column_name="uuid"
+    )
+
+    expected_hashes = [
+        hashlib.sha256(document.encode()).hexdigest()
+        for document in sample_dataset["document"]
+    ]
+
+    assert formatted_dataset["hash"] == expected_hashes
+    assert len(set(formatted_dataset["uuid"])) == 2
+
+
+def test_num_proc_small_dataset(
+    sample_dataset: Dataset
+):
+    """
+    Test that `DatasetFormatter` processes small datasets in the current process.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    Asserts
+    -------
+    Asserts that no worker is spawned for fewer rows than one worker is given.
+    """
+    formatter = DatasetFormatter(
+        sample_dataset, 
+        batch_size=1, 
+        num_proc=2
+    )
+
+    assert formatter._num_proc() == 1
+
+
+def test_build(
+    sample_dataset: Dataset
+):
+    """
+    Test the lazy pipeline of `DatasetFormatter` applied by `build`.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    Asserts
+    -------
+    Asserts that the recorded transforms are applied in order in a single pass.
+    """
+    formatter = DatasetFormatter(
+        sample_dataset, 
+        eager=False
+    )
+    formatter.hash().normalize_text("document", "normalized").drop_column("document")
+
+    with pytest.raises(RuntimeError):
+        formatter.filter_expr(pc.field("hash") != "")
+
+    formatted_dataset = formatter.build()
+
+    expected_hash = hashlib.sha256(
+        "This is a test document.".encode()
+    ).hexdigest()
+
+    assert formatted_dataset.column_names == ["hash", "normalized"]
+    assert formatted_dataset[0]["hash"] == expected_hash
+    assert formatted_dataset[0]["normalized"] == "this is a test document."
+
+
+def test_build_restricted_format(
+    sample_dataset: Dataset
+):
+    """
+    Test the lazy pipeline of `DatasetFormatter` on a dataset with a restricted format.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    Asserts
+    -------
+    Asserts that the format columns follow a recorded rename, as they do in eager mode.
+    """
+    dataset = sample_dataset.add_column("title", ["a", "b"]).with_format(
+        "numpy", 
+        columns=["document"]
+    )
+
+    formatter = DatasetFormatter(
+        dataset, 
+        eager=False
+    )
+    formatted_dataset = formatter.rename_column("document", "doc").build()
+
+    assert formatted_dataset.format["columns"] == ["doc"]
+    assert formatted_dataset.format["type"] == "numpy"
+
+
+def test_hash_prefetch(
+    sample_dataset: Dataset
+):
+    """
+    Test the `hash` method of `DatasetFormatter` with batches read ahead.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    Asserts
+    -------
+    Asserts that the hash column matches the one computed by a batched `map`.
+    """
+    formatter = DatasetFormatter(
+        sample_dataset, 
+        batch_size=1, 
+        prefetch=2
+    )
+    formatted_dataset = formatter.hash(
+        column_name="document", 
+        hash_column_name="hash"
+    )
+
+    expected_hashes = [
+        hashlib.sha256(document.encode()).hexdigest()
+        for document in sample_dataset["document"]
+    ]
+
+    assert formatted_dataset["hash"] == expected_hashes
+
+
+def test_hash_device(
+    sample_dataset: Dataset
+):
+    """
+    Test the `device` argument of the `hash` method of `DatasetFormatter`.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    Asserts
+    -------
+    Asserts that the "cuda" device yields the same digests as the CPU, whether
+    it is available or not, and that unsupported devices are rejected.
+    """
+    formatter = DatasetFormatter(sample_dataset)
+    formatted_dataset = formatter.hash(device="cuda")
+
+    expected_hashes = [
+        hashlib.sha256(document.encode()).hexdigest()
+        for document in sample_dataset["document"]
+    ]
+
+    assert formatted_dataset["hash"] == expected_hashes
+
+    with pytest.raises(ValueError):
+        formatter.hash(device="tpu")
+
+    with pytest.raises(ValueError):
+        formatter.hash(hash_algorithm="blake3", device="cuda")
+
+
+def test_hash_device_single_process(
+    sample_dataset: Dataset, 
+    monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that the `hash` method of `DatasetFormatter` does not fork workers on a CUDA device.
+
+    Parameters
+    ----------
+    sample_dataset : datasets.Dataset
+        The sample dataset fixture.
+
+    monkeypatch : pytest.MonkeyPatch
+        The pytest fixture used to report a CUDA device, allow one row per process and record the `map` calls.
+
+    Asserts
+    -------
+    Asserts that the batches are mapped in the current process, eagerly and through `build`.
+    """
+    module = sys.modules[DatasetFormatter.__module__]
+    monkeypatch.setattr(module, "cuda_available", lambda: True)
+    monkeypatch.setattr(module, "_MIN_ROWS_PER_PROCESS", 1)
+
+    map_num_procs = []
+    dataset_map = Dataset.map
+
+    def map(self, *args, **kwargs):
+        map_num_procs.append(kwargs.get("num_proc"))
+
+        return dataset_map(self, *args, **kwargs)
+
+    monkeypatch.setattr(Dataset, "map", map)
+
+    formatter = DatasetFormatter(
+        sample_dataset, 
+        batch_size=1, 
+        num_proc=2
+    )
+    formatter.hash(device="cuda")
+
+    lazy_formatter = DatasetFormatter(
+        sample_dataset, 
+        batch_size=1, 
+        num_proc=2, 
+        eager=False
+    )
+    lazy_formatter.hash(device="cuda").normalize_text("document").build()
+
+    assert map_num_procs == [None, None]
+
+
+def test_normalize_text_non_ascii():
+    """
+    Test the `normalize_text` method of `DatasetFormatter` on non-ASCII text.
+
+    Asserts
+    -------
+    Asserts that accented letters are lowercased and Unicode whitespace is stripped.
+    """
+    dataset = datasets.Dataset.from_dict(
+        {
+            "document": [
+                "  ÉTAT DE DROIT ", 
+                "\u00a0Code Civil\n"
+            ]
+        }
+    )
+
+    formatter = DatasetFormatter(dataset)
+    formatted_dataset = formatter.normalize_text("document")
+
+    assert formatted_dataset["document"] == ["état de droit", "code civil"]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2])
+def test_normalize_text_mixed_batch(
+    batch_size: int
+):
+    """
+    Test the `normalize_text` method of `DatasetFormatter` on batches mixing ASCII and non-ASCII text.
+
+    Parameters
+    ----------
+    batch_size : int
+        The number of rows per batch.
+
+    Asserts
+    -------
+    Asserts that each row is normalized like `str.lower().strip()`, whatever its batch.
+    """
+    documents = ["\x1fABC\x1f", "Été"]
+    dataset = datasets.Dataset.from_dict({"document": documents})
+
+    formatter = DatasetFormatter(dataset, batch_size=batch_size)
+    formatted_dataset = formatter.normalize_text("document")
+
+    assert formatted_dataset["document"] == [document.lower().strip() for document in documents]